@@ -1,7 +1,7 @@
 # Sovereign Local Quant (SLQ) TUI Dashboard
 import sys
-from pathlib import Path
 import pandas as pd
+from datetime import date
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
@@ -10,10 +10,13 @@ from rich.align import Align
 from rich.theme import Theme
 from rich import box
 
+from config import MODEL_CONFIG, BACKTEST_CONFIG
+
 from src.ingestion.downloader import download_data
 from src.modeling.training import train_single_stock
 from src.backtesting.engine import Backtester
 from src.reporting.html_report import generate_html_report
+from src.reporting.experiment_store import CATALOG_PATH, ExperimentStore, SORTABLE_COLUMNS, hash_data
 from src.modeling.models.lightgbm_model import LightGBMModel
 
 custom_theme = Theme({
@@ -108,12 +111,25 @@ def train_and_backtest_screen():
         if isinstance(df.columns, pd.MultiIndex):
             df.columns = [col[0] for col in df.columns]
 
+        data_hash = hash_data(df)
         backtester = Backtester(model.model, df)
         results = backtester.run()
 
         # Generate report
         report_path = f"experiments/{ticker}_report.html"
-        generate_html_report(results, ticker, report_path)
+        metrics = generate_html_report(results, ticker, report_path)
+
+        # Record the run in the experiment catalog
+        with ExperimentStore() as store:
+            store.record_run(
+                ticker=ticker,
+                metrics=metrics,
+                equity_curve=results.cumulative_strategy_returns,
+                params=MODEL_CONFIG['params'],
+                config={'model': MODEL_CONFIG, 'backtest': BACKTEST_CONFIG, 'data_path': data_path},
+                data_hash=data_hash,
+                report_path=report_path,
+            )
 
         console.print("[success]Training, backtesting, and reporting complete![/success]")
         console.print(f"View the report at: [highlight]{report_path}[/highlight]")
@@ -128,16 +144,71 @@ def view_reports_screen():
     show_banner()
     console.print("[highlight]View Reports[/highlight]\n")
 
-    reports = list(Path("experiments").glob("*_report.html"))
+    ticker = console.input("[menu]Filter by ticker (default: all): [/menu]").strip().upper() or None
+    month_start = date.today().replace(day=1).isoformat()
+    since = console.input(f"[menu]Runs since (YYYY-MM-DD, 'month' for {month_start}, default: all): [/menu]").strip() or None
+    if since == "month":
+        since = month_start
+    sort_by = console.input("[menu]Sort by (default: sharpe_ratio): [/menu]").strip() or "sharpe_ratio"
+    page_size_str = console.input("[menu]Rows per page (default: 20): [/menu]").strip()
+    page_size = int(page_size_str) if page_size_str.isdigit() and int(page_size_str) > 0 else 20
+
+    if sort_by not in SORTABLE_COLUMNS:
+        console.print(f"[error]Cannot sort by '{sort_by}'. Choose one of: {', '.join(SORTABLE_COLUMNS)}[/error]")
+        console.input("[menu]Press Enter to return to main menu...[/menu]")
+        return
 
-    if not reports:
+    if not CATALOG_PATH.exists():
         console.print("[menu]No reports available yet.[/menu]")
-    else:
-        table = Table(show_header=True, header_style="highlight", box=box.ROUNDED)
-        table.add_column("Report File", justify="left")
-        for report in reports:
-            table.add_row(str(report))
-        console.print(table)
+        console.input("[menu]Press Enter to return to main menu...[/menu]")
+        return
+
+    try:
+        with ExperimentStore(read_only=True) as store:
+            total = store.count_runs(ticker=ticker, since=since)
+            page = 0
+            while True:
+                if total == 0:
+                    console.print("[menu]No reports available yet.[/menu]")
+                    break
+
+                runs = store.query_runs(ticker=ticker, since=since, sort_by=sort_by,
+                                        limit=page_size, offset=page * page_size)
+                table = Table(show_header=True, header_style="highlight", box=box.ROUNDED)
+                table.add_column("#", justify="right")
+                table.add_column("Created", justify="left")
+                table.add_column("Ticker", justify="center")
+                table.add_column("Period", justify="center")
+                table.add_column("Sharpe", justify="right")
+                table.add_column("Max DD", justify="right")
+                table.add_column("Ann. Return", justify="right")
+                table.add_column("Report", justify="left")
+                for i, run in enumerate(runs.itertuples(), start=page * page_size + 1):
+                    table.add_row(
+                        str(i),
+                        f"{run.created_at:%Y-%m-%d %H:%M}",
+                        run.ticker,
+                        f"{run.start_date} - {run.end_date}",
+                        f"{run.sharpe_ratio:.2f}",
+                        f"{run.max_drawdown * 100:.2f}%",
+                        f"{run.annualized_return * 100:.2f}%",
+                        run.report_path or "",
+                    )
+                pages = (total + page_size - 1) // page_size
+                console.print(table)
+                console.print(f"[menu]Page {page + 1} of {pages} ({total} runs)[/menu]")
+
+                action = console.input("[menu][n]ext, [p]revious, or Enter to return: [/menu]").strip().lower()
+                if action == "n" and page + 1 < pages:
+                    page += 1
+                elif action == "p" and page > 0:
+                    page -= 1
+                elif action not in ("n", "p"):
+                    return
+                console.clear()
+                show_banner()
+    except Exception as e:
+        console.print(f"[error]An error occurred: {e}[/error]")
 
     console.input("[menu]Press Enter to return to main menu...[/menu]")
 
@@ -61,6 +61,16 @@ BACKTEST_CONFIG = {
     "commission_bps": 1.5, # 1.5 basis points
 }
 
+# --- Risk / Position Sizing ---
+RISK_CONFIG = {
+    "estimator": "ledoit_wolf", # sample, ledoit_wolf or ewma
+    "window": 63, # ~3 months of daily returns
+    "halflife": 21, # for the ewma estimator
+    "target_vol": 0.10, # 10% annualized
+    "max_leverage": 1.0,
+    "benchmark": "SPY",
+}
+
 # --- TUI ---
 TUI_CONFIG = {
     "color_scheme": {
@@ -3,7 +3,7 @@ import numpy as np
 from pathlib import Path
 import joblib
 
-from src.modeling.models.lightgbm_model import LightGBMModel
+from src.backtesting.risk import RiskModel
 from src.features.library.indicators import (
     calculate_returns,
     calculate_volatility,
@@ -12,38 +12,99 @@ from src.features.library.indicators import (
     get_day_of_week,
 )
 
+class BacktestResult:
+    """
+    Compact result of a backtest run.
+
+    Positions, strategy returns and equity are stored as float32 arrays next to
+    a reference to the input's timestamp index, so thousands of results can be
+    kept in memory. pandas objects are only built when one is requested.
+    """
+    __slots__ = ('index', 'positions', 'returns', 'equity')
+
+    def __init__(self, index: pd.Index, positions: np.ndarray, returns: np.ndarray, equity: np.ndarray):
+        self.index = index
+        self.positions = np.asarray(positions, dtype=np.float32)
+        self.returns = np.asarray(returns, dtype=np.float32)
+        self.equity = np.asarray(equity, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def position(self) -> pd.Series:
+        """Position held over each period, as a Series view."""
+        return pd.Series(self.positions, index=self.index, name='position', copy=False)
+
+    @property
+    def strategy_returns(self) -> pd.Series:
+        """Strategy returns for each period, as a Series view."""
+        return pd.Series(self.returns, index=self.index, name='strategy_returns', copy=False)
+
+    @property
+    def cumulative_strategy_returns(self) -> pd.Series:
+        """Equity curve starting from 1, as a Series view."""
+        return pd.Series(self.equity, index=self.index, name='cumulative_strategy_returns', copy=False)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the result's own arrays (the shared index is not counted)."""
+        return self.positions.nbytes + self.returns.nbytes + self.equity.nbytes
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns all series in a single DataFrame."""
+        return pd.concat([self.position, self.strategy_returns, self.cumulative_strategy_returns], axis=1)
+
 class Backtester:
-    def __init__(self, model, data):
+    def __init__(self, model, data, risk_model: RiskModel | None = None):
         self.model = model
         self.data = data
+        self.risk_model = risk_model
         self.results = None
 
-    def run(self):
-        """Runs the backtest."""
+    def run(self) -> BacktestResult:
+        """Runs the backtest without modifying the input data."""
         # Feature Engineering
-        self.data['returns'] = calculate_returns(self.data)
-        self.data['volatility'] = calculate_volatility(self.data)
-        self.data['rsi'] = calculate_rsi(self.data)
-        self.data['skew'] = calculate_rolling_skew(self.data)
-        self.data['day_of_week'] = get_day_of_week(self.data)
-
-        self.data.dropna(inplace=True)
-
-        X = self.data[['returns', 'volatility', 'rsi', 'skew', 'day_of_week']]
+        features = pd.DataFrame({
+            'returns': calculate_returns(self.data),
+            'volatility': calculate_volatility(self.data),
+            'rsi': calculate_rsi(self.data),
+            'skew': calculate_rolling_skew(self.data),
+            'day_of_week': get_day_of_week(self.data),
+        }, index=self.data.index)
+
+        valid = features.notna().all(axis=1).to_numpy()
+        rows = np.flatnonzero(valid)
+        features = features[valid]
+        if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+            # Warm-up rows only at the start: slice so the index shares the input's buffer
+            index = self.data.index[rows[0]:rows[-1] + 1]
+        else:
+            index = self.data.index[valid]
 
         # Make predictions
-        predictions = self.model.predict(X)
-        self.data['prediction'] = predictions
+        predictions = self.model.predict(features)
+        asset_returns = features['returns'].to_numpy()
 
         # Calculate strategy returns
         # Long only: if prediction is 1, hold the stock. If 0, be in cash.
         # The return is the next day's return.
-        self.data['strategy_returns'] = np.where(self.data['prediction'].shift(1) == 1, self.data['returns'], 0)
+        if self.risk_model is None:
+            targets = (predictions == 1).astype(np.float64)
+        else:
+            # Size the position to the risk model's volatility target instead of holding 100%
+            # Single-asset frames for the risk model, sharing one neutral column label
+            returns = features[['returns']].set_axis(['asset'], axis=1)
+            signals = pd.DataFrame({'asset': (predictions == 1).astype(float)}, index=features.index)
+            targets = self.risk_model.target_weights(signals, returns)['asset'].to_numpy()
+        positions = np.zeros(len(targets))
+        positions[1:] = targets[:-1]
+        strategy_returns = positions * asset_returns
 
         # Calculate cumulative returns
-        self.data['cumulative_strategy_returns'] = (1 + self.data['strategy_returns']).cumprod()
+        equity = np.cumprod(1 + strategy_returns)
 
-        self.results = self.data
+        self.results = BacktestResult(index, positions, strategy_returns, equity)
         return self.results
 
     def plot_equity_curve(self):
@@ -51,11 +112,13 @@ class Backtester:
         if self.results is None:
             print("Please run the backtest first.")
             return
-        self.results['cumulative_strategy_returns'].plot(title="Equity Curve")
+        self.results.cumulative_strategy_returns.plot(title="Equity Curve")
         import matplotlib.pyplot as plt
         plt.show()
 
 if __name__ == '__main__':
+    from src.modeling.models.lightgbm_model import LightGBMModel
+
     # Load model and data
     ticker = "AAPL"
     model_path = f"experiments/{ticker}_model.pkl"
@@ -75,8 +138,8 @@ if __name__ == '__main__':
     backtester = Backtester(model.model, df)
     results = backtester.run()
 
-    print(results[['returns', 'prediction', 'strategy_returns', 'cumulative_strategy_returns']].head(20))
-    print(results[['returns', 'prediction', 'strategy_returns', 'cumulative_strategy_returns']].tail(20))
+    print(results.to_frame().head(20))
+    print(results.to_frame().tail(20))
 
     # The plot will not work in this environment, but the code is there.
     # backtester.plot_equity_curve()
@@ -0,0 +1,288 @@
+import sys
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from config import PROCESSED_DATA_DIR, BACKTEST_CONFIG
+
+# A strategy maps a chunk of bars (plus any lookback rows) to the target position,
+# in shares, that should be held after the *next* bar's open.
+Strategy = Callable[[pd.DataFrame], np.ndarray]
+
+PRICE_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+@dataclass
+class IntradayState:
+    """Portfolio and order state carried across chunk boundaries."""
+    cash: float
+    position: float = 0.0        # shares currently held
+    pending_target: float = 0.0  # target set on the last bar seen, filled at the next open
+    equity: float = np.nan       # mark-to-market equity at the last close
+    peak_equity: float = np.nan
+    max_drawdown: float = 0.0
+    bars: int = 0
+    skipped_bars: int = 0        # bars without a usable Open/Close
+    trades: int = 0
+    commission_paid: float = 0.0
+    slippage_paid: float = 0.0
+    # Running moments of bar returns, so Sharpe needs no per-bar history
+    return_sum: float = 0.0
+    return_sq_sum: float = 0.0
+
+
+@dataclass
+class IntradayResult:
+    """Summary of an intraday backtest. Per-bar history is not retained."""
+    symbol: str
+    initial_cash: float
+    final_equity: float
+    final_position: float
+    bars: int
+    skipped_bars: int
+    trades: int
+    commission_paid: float
+    slippage_paid: float
+    max_drawdown: float
+    bar_return_mean: float
+    bar_return_std: float
+    equity_curve: pd.Series = field(repr=False)  # equity at the end of each chunk
+
+    @property
+    def total_return(self) -> float:
+        return self.final_equity / self.initial_cash - 1
+
+    def sharpe_ratio(self, bars_per_year: int = 252 * 390) -> float:
+        """Annualized Sharpe ratio of bar returns (390 regular-session minutes per day)."""
+        if self.bar_return_std == 0 or np.isnan(self.bar_return_std):
+            return np.nan
+        return self.bar_return_mean / self.bar_return_std * np.sqrt(bars_per_year)
+
+
+def minute_bar_path(symbol: str, interval: str = '1m') -> Path:
+    """Returns the partitioned Parquet path written by the yfinance connector."""
+    return PROCESSED_DATA_DIR / f"symbol={symbol}" / f"interval={interval.upper()}" / "data.parquet"
+
+
+def _resolve_column(names: list[str], wanted: str) -> str | None:
+    """
+    Finds a price column regardless of how the ingestion step flattened it.
+
+    Matches 'Close', 'Close_AAPL' (yfinance connector) and "('Close', 'AAPL')"
+    (MultiIndex columns written by the downloader).
+    """
+    for name in names:
+        if name == wanted or name.startswith(f"{wanted}_") or name.startswith(f"('{wanted}'"):
+            return name
+    return None
+
+
+class IntradayBacktester:
+    """
+    Event-driven backtester that streams minute bars from Parquet in chunks.
+
+    Orders generated on bar t are filled at the open of bar t+1, adjusted by
+    `slippage_bps` against the trade direction, and charged `commission_bps`
+    on the traded notional. Position, cash and the pending order are carried
+    across chunk boundaries, so memory is bounded by `chunk_size` regardless
+    of the length of the file. Bars missing an Open or Close are skipped and
+    counted in `skipped_bars`.
+    """
+
+    def __init__(
+        self,
+        strategy: Strategy | None = None,
+        signal_column: str = 'target_position',
+        initial_cash: float = 100_000.0,
+        slippage_bps: float = BACKTEST_CONFIG['slippage_bps'],
+        commission_bps: float = BACKTEST_CONFIG['commission_bps'],
+        chunk_size: int | None = None,
+        lookback: int = 0,
+    ):
+        """
+        Args:
+            strategy (Strategy, optional): Callable returning target positions (in shares)
+                for each bar of the chunk it is given. If None, targets are read from
+                `signal_column` in the Parquet file.
+            signal_column (str): Column holding precomputed target positions.
+            initial_cash (float): Starting cash.
+            slippage_bps (float): Slippage applied to fill prices, in basis points.
+            commission_bps (float): Commission on traded notional, in basis points.
+            chunk_size (int, optional): Bars per chunk. Defaults to the file's row-group size.
+            lookback (int): Trailing bars of the previous chunk prepended to the frame passed
+                to `strategy`, so rolling indicators are continuous across chunks.
+        """
+        self.strategy = strategy
+        self.signal_column = signal_column
+        self.initial_cash = initial_cash
+        self.slippage = slippage_bps / 1e4
+        self.commission = commission_bps / 1e4
+        self.chunk_size = chunk_size
+        self.lookback = lookback
+
+    def _iter_chunks(self, path: Path) -> Iterator[pd.DataFrame]:
+        """Yields row-group-sized chunks containing only the columns the run needs."""
+        parquet_file = pq.ParquetFile(path)
+        names = parquet_file.schema_arrow.names
+
+        columns = {}
+        for wanted in PRICE_FIELDS if self.strategy is not None else ('Open', 'Close'):
+            name = _resolve_column(names, wanted)
+            if name is not None:
+                columns[name] = wanted
+        if 'Open' not in columns.values() or 'Close' not in columns.values():
+            raise ValueError(f"{path} must contain 'Open' and 'Close' columns.")
+        if self.strategy is None:
+            if self.signal_column not in names:
+                raise ValueError(f"{path} has no '{self.signal_column}' column and no strategy was given.")
+            columns[self.signal_column] = self.signal_column
+
+        pandas_metadata = parquet_file.schema_arrow.pandas_metadata or {}
+        index_columns = [c for c in pandas_metadata.get('index_columns', []) if isinstance(c, str)]
+
+        batch_size = self.chunk_size
+        if batch_size is None:
+            batch_size = parquet_file.metadata.row_group(0).num_rows if parquet_file.num_row_groups else 1
+
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=list(columns) + index_columns):
+            chunk = batch.to_pandas()
+            # Batches carry the pandas metadata, so the index is usually restored already
+            present = [c for c in index_columns if c in chunk.columns]
+            if present:
+                chunk = chunk.set_index(present)
+            yield chunk.rename(columns=columns)
+
+    def _targets(self, chunk: pd.DataFrame, tail: pd.DataFrame | None) -> np.ndarray:
+        if self.strategy is None:
+            targets = chunk[self.signal_column].to_numpy(dtype=np.float64)
+        elif tail is not None and len(tail):
+            targets = np.asarray(self.strategy(pd.concat([tail, chunk])), dtype=np.float64)[len(tail):]
+        else:
+            targets = np.asarray(self.strategy(chunk), dtype=np.float64)
+        if len(targets) != len(chunk):
+            raise ValueError("Strategy must return one target position per bar.")
+        # Bars without a signal (e.g. indicator warm-up) are treated as flat
+        return np.nan_to_num(targets, nan=0.0)
+
+    def _process_chunk(self, state: IntradayState, opens: np.ndarray, closes: np.ndarray, targets: np.ndarray):
+        """Vectorized fills and mark-to-market for one chunk, updating `state` in place."""
+        # Position held after the open of each bar is the target set on the bar before it
+        held = np.empty_like(targets)
+        held[0] = state.pending_target
+        held[1:] = targets[:-1]
+        previous = np.empty_like(held)
+        previous[0] = state.position
+        previous[1:] = held[:-1]
+
+        quantity = held - previous
+        fill_prices = opens * (1 + np.sign(quantity) * self.slippage)
+        notional = quantity * fill_prices
+        commissions = np.abs(notional) * self.commission
+
+        cash = state.cash - np.cumsum(notional + commissions)
+        equity = cash + held * closes
+
+        prior_equity = np.empty_like(equity)
+        prior_equity[0] = state.equity if state.bars else self.initial_cash
+        prior_equity[1:] = equity[:-1]
+        bar_returns = equity / prior_equity - 1
+
+        peak = np.maximum.accumulate(equity)
+        if state.bars:
+            peak = np.maximum(peak, state.peak_equity)
+        else:
+            peak = np.maximum(peak, self.initial_cash)
+        drawdown = (equity - peak) / peak
+
+        state.cash = float(cash[-1])
+        state.position = float(held[-1])
+        state.pending_target = float(targets[-1])
+        state.equity = float(equity[-1])
+        state.peak_equity = float(peak[-1])
+        state.max_drawdown = min(state.max_drawdown, float(drawdown.min()))
+        state.bars += len(targets)
+        state.trades += int(np.count_nonzero(quantity))
+        state.commission_paid += float(commissions.sum())
+        state.slippage_paid += float(np.abs(quantity * opens).sum() * self.slippage)
+        state.return_sum += float(bar_returns.sum())
+        state.return_sq_sum += float(np.dot(bar_returns, bar_returns))
+
+    def run(self, path: str | Path, symbol: str = '') -> IntradayResult:
+        """
+        Runs the backtest over a single Parquet file of bars.
+
+        Args:
+            path (str | Path): Path to the Parquet file.
+            symbol (str): Symbol label for the result.
+
+        Returns:
+            IntradayResult: Summary statistics and a per-chunk equity curve.
+        """
+        state = IntradayState(cash=self.initial_cash)
+        tail = None
+        curve_index, curve_values = [], []
+
+        for chunk in self._iter_chunks(Path(path)):
+            if chunk.empty:
+                continue
+            targets = self._targets(chunk, tail)
+            opens = chunk['Open'].to_numpy(dtype=np.float64)
+            closes = chunk['Close'].to_numpy(dtype=np.float64)
+
+            # Empty bars are skipped: no fill, no mark-to-market, and no new order,
+            # so the pending order carries forward to the next bar with prices
+            priced = np.isfinite(opens) & np.isfinite(closes)
+            state.skipped_bars += int(len(priced) - np.count_nonzero(priced))
+            if priced.any():
+                self._process_chunk(state, opens[priced], closes[priced], targets[priced])
+                curve_index.append(chunk.index[priced][-1])
+                curve_values.append(state.equity)
+            if self.strategy is not None and self.lookback:
+                # The tail may span several chunks when chunk_size < lookback
+                tail = (chunk if tail is None else pd.concat([tail, chunk])).iloc[-self.lookback:]
+
+        if state.bars:
+            mean = state.return_sum / state.bars
+            variance = state.return_sq_sum / state.bars - mean ** 2
+            std = np.sqrt(max(variance, 0.0) * state.bars / (state.bars - 1)) if state.bars > 1 else np.nan
+        else:
+            mean, std = np.nan, np.nan
+
+        return IntradayResult(
+            symbol=symbol,
+            initial_cash=self.initial_cash,
+            final_equity=state.equity if state.bars else self.initial_cash,
+            final_position=state.position,
+            bars=state.bars,
+            skipped_bars=state.skipped_bars,
+            trades=state.trades,
+            commission_paid=state.commission_paid,
+            slippage_paid=state.slippage_paid,
+            max_drawdown=state.max_drawdown,
+            bar_return_mean=mean,
+            bar_return_std=std,
+            equity_curve=pd.Series(curve_values, index=curve_index, name='equity', dtype=np.float64),
+        )
+
+    def run_universe(self, symbols: list[str], interval: str = '1m') -> dict[str, IntradayResult]:
+        """Runs the backtest for each symbol's partition in turn, one file in memory at a time."""
+        return {symbol: self.run(minute_bar_path(symbol, interval), symbol=symbol) for symbol in symbols}
+
+
+if __name__ == '__main__':
+    # Simple example: hold 100 shares whenever the close is above its 30-bar mean
+    def moving_average_strategy(bars: pd.DataFrame) -> np.ndarray:
+        above = bars['Close'] > bars['Close'].rolling(30).mean()
+        return np.where(above, 100.0, 0.0)
+
+    backtester = IntradayBacktester(strategy=moving_average_strategy, lookback=30)
+    for symbol, result in backtester.run_universe(["SPY", "QQQ"]).items():
+        print(f"{symbol}: equity={result.final_equity:.2f} trades={result.trades} "
+              f"sharpe={result.sharpe_ratio():.2f} max_dd={result.max_drawdown:.2%}")
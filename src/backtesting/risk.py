@@ -0,0 +1,330 @@
+import sys
+import os
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from config import RISK_CONFIG
+
+ESTIMATORS = ('sample', 'ledoit_wolf', 'ewma')
+
+
+class RollingCovariance:
+    """
+    Covariance over a fixed trailing window, updated incrementally.
+
+    Each update adds the newest return vector to the running sums and removes
+    the one that falls out of the window, so a step costs O(n^2) instead of the
+    O(window * n^2) of recomputing the window. Missing returns are treated as
+    zero so every update sees a dense vector. Rows and columns of assets without
+    a full window of data are therefore understated. The covariance block of
+    assets with a full window is exact, and `ledoit_wolf` estimates its target
+    and shrinkage from that block alone.
+    """
+
+    def __init__(self, n_assets: int, window: int):
+        self.n_assets = n_assets
+        self.window = window
+        self._buffer = np.zeros((window, n_assets))
+        self._position = 0
+        self.count = 0
+        self._sum = np.zeros(n_assets)
+        self._cross = np.zeros((n_assets, n_assets))
+        self._valid = np.zeros((window, n_assets), dtype=bool)
+        self._valid_count = np.zeros(n_assets, dtype=np.int64)
+
+    def update(self, x: np.ndarray):
+        """Adds one period of returns, dropping the oldest period once the window is full."""
+        x = np.asarray(x, dtype=np.float64)
+        valid = ~np.isnan(x)
+        x = np.where(valid, x, 0.0)
+        if self.count == self.window:
+            old = self._buffer[self._position]
+            # Rank-2 update of the cross-product matrix in a single BLAS call
+            self._cross += np.stack([x, old]).T @ np.stack([x, -old])
+            self._sum += x - old
+            self._valid_count -= self._valid[self._position]
+        else:
+            self._cross += np.outer(x, x)
+            self._sum += x
+            self.count += 1
+        self._valid_count += valid
+        self._buffer[self._position] = x
+        self._valid[self._position] = valid
+        self._position = (self._position + 1) % self.window
+
+    def eligible(self) -> np.ndarray:
+        """Returns a mask of assets with a valid return in every period of a full window."""
+        return self._valid_count >= self.window
+
+    def _centered_cross(self) -> np.ndarray:
+        """Returns sum_t (x_t - mean)(x_t - mean)^T, with one allocation and in-place updates."""
+        centered = np.outer(self._sum, -self._sum / self.count)
+        centered += self._cross
+        return centered
+
+    def covariance(self) -> np.ndarray:
+        """Returns the unbiased sample covariance of the current window."""
+        if self.count < 2:
+            return np.full((self.n_assets, self.n_assets), np.nan)
+        cov = self._centered_cross()
+        cov /= self.count - 1
+        return cov
+
+    def ledoit_wolf(self) -> tuple[np.ndarray, float]:
+        """
+        Returns the Ledoit-Wolf shrunk covariance of the current window and its shrinkage.
+
+        Shrinks toward a scaled identity, matching `sklearn.covariance.ledoit_wolf`.
+        The target and intensity are estimated over the assets with a full window
+        only, so zero-filled assets do not change the sizing of the others. Their
+        entries are scaled like the rest but get no target added, and should not be
+        used for sizing. The fourth-moment term is read from
+        the window buffer in O(window * n), so a call stays O(n^2).
+        """
+        n = self.count
+        if n < 2:
+            return np.full((self.n_assets, self.n_assets), np.nan), np.nan
+        emp_cov = self._centered_cross()
+        emp_cov /= n
+
+        eligible = self.eligible()
+        p = int(eligible.sum())
+        if p == 0:
+            return emp_cov, 0.0
+        diagonal = np.flatnonzero(eligible) * (self.n_assets + 1)
+        trace = emp_cov.flat[diagonal].sum()
+        mu = trace / p
+
+        # sum_t ||x_t - mean||^4 over the eligible assets
+        centered = self._buffer[:n, eligible] - self._sum[eligible] / n
+        norms = np.einsum('ij,ij->i', centered, centered)
+        fourth = norms @ norms
+
+        # Sum of squares over the eligible block, without copying it out
+        mask = eligible.astype(np.float64)
+        emp_sq = mask @ np.square(emp_cov) @ mask
+        beta = (fourth / n - emp_sq) / (p * n)
+        delta = (emp_sq - 2 * mu * trace + p * mu ** 2) / p
+        beta = min(beta, delta)
+        shrinkage = 0.0 if beta <= 0 else beta / delta
+
+        emp_cov *= 1 - shrinkage
+        emp_cov.flat[diagonal] += shrinkage * mu
+        return emp_cov, shrinkage
+
+
+class EWMACovariance:
+    """
+    Exponentially weighted (RiskMetrics-style) covariance of zero-mean returns.
+
+    Early estimates are bias-corrected by the total weight seen so far, so the
+    first observations are not dragged toward zero. Missing returns are treated
+    as zero. The memory reaches back past any fixed window, so an asset that
+    has just completed `window` valid periods still carries decayed zero-fills
+    from before it, and its variance is slightly understated.
+    """
+
+    def __init__(self, n_assets: int, halflife: float):
+        self.n_assets = n_assets
+        self.decay = 0.5 ** (1 / halflife)
+        self.count = 0
+        self._weight = 0.0
+        self._cov = np.zeros((n_assets, n_assets))
+
+    def update(self, x: np.ndarray):
+        """Adds one period of returns."""
+        x = np.nan_to_num(np.asarray(x, dtype=np.float64))
+        self._cov *= self.decay
+        self._cov += np.outer((1 - self.decay) * x, x)
+        self._weight = self.decay * self._weight + (1 - self.decay)
+        self.count += 1
+
+    def covariance(self) -> np.ndarray:
+        if self.count == 0:
+            return np.full((self.n_assets, self.n_assets), np.nan)
+        return self._cov / self._weight
+
+
+def rolling_covariances(
+    returns: pd.DataFrame,
+    estimator: str = RISK_CONFIG['estimator'],
+    window: int = RISK_CONFIG['window'],
+    halflife: float = RISK_CONFIG['halflife'],
+) -> Iterator[tuple[pd.Timestamp, np.ndarray]]:
+    """
+    Yields the covariance matrix at each date, estimated from returns up to and including that date.
+
+    Args:
+        returns (pd.DataFrame): Periodic returns, one column per asset.
+        estimator (str): 'sample', 'ledoit_wolf' or 'ewma'.
+        window (int): Trailing window for 'sample' and 'ledoit_wolf'; also the
+            warm-up period for 'ewma'.
+        halflife (float): Half-life in periods for 'ewma'.
+
+    Yields:
+        tuple[pd.Timestamp, np.ndarray]: Date and covariance, once `window` periods have been seen.
+    """
+    if estimator not in ESTIMATORS:
+        raise ValueError(f"Unknown estimator '{estimator}'. Choose one of {ESTIMATORS}.")
+
+    n_assets = returns.shape[1]
+    model = EWMACovariance(n_assets, halflife) if estimator == 'ewma' else RollingCovariance(n_assets, window)
+    values = returns.to_numpy(dtype=np.float64)
+
+    for timestamp, row in zip(returns.index, values):
+        model.update(row)
+        if model.count < window:
+            continue
+        if estimator == 'ledoit_wolf':
+            yield timestamp, model.ledoit_wolf()[0]
+        else:
+            yield timestamp, model.covariance()
+
+
+def betas_from_covariance(cov: np.ndarray, benchmark_index: int) -> np.ndarray:
+    """Returns each asset's beta to the benchmark column of a covariance matrix."""
+    return cov[:, benchmark_index] / cov[benchmark_index, benchmark_index]
+
+
+def rolling_betas(returns: pd.DataFrame, benchmark: str = RISK_CONFIG['benchmark'],
+                  window: int = RISK_CONFIG['window']) -> pd.DataFrame:
+    """
+    Calculates rolling betas of every column against the benchmark column in one pass.
+
+    Args:
+        returns (pd.DataFrame): Periodic returns, including the benchmark column.
+        benchmark (str): Benchmark column name (e.g. 'SPY').
+        window (int): Rolling window size.
+
+    Returns:
+        pd.DataFrame: Betas with the same shape as `returns`; NaN during warm-up.
+    """
+    if benchmark not in returns.columns:
+        raise ValueError(f"Benchmark '{benchmark}' is not in the returns columns.")
+    x = returns.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(x)
+    y = x[:, [returns.columns.get_loc(benchmark)]]
+    pair = valid & ~np.isnan(y)
+    x, y = np.where(pair, x, 0.0), np.where(pair, y, 0.0)
+
+    def window_sum(a):
+        cumulative = np.cumsum(a, axis=0)
+        cumulative[window:] = cumulative[window:] - cumulative[:-window]
+        return cumulative
+
+    n = window_sum(pair.astype(np.float64))
+    sum_x, sum_y = window_sum(x), window_sum(y)
+    sum_xy, sum_yy = window_sum(x * y), window_sum(y * y)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov_xy = sum_xy - sum_x * sum_y / n
+        var_y = sum_yy - sum_y ** 2 / n
+        betas = cov_xy / var_y
+    betas[n < window] = np.nan
+    return pd.DataFrame(betas, index=returns.index, columns=returns.columns)
+
+
+def volatility_target_weights(
+    cov: np.ndarray,
+    signals: np.ndarray,
+    target_vol: float = RISK_CONFIG['target_vol'],
+    max_leverage: float = RISK_CONFIG['max_leverage'],
+    periods_per_year: int = 252,
+) -> np.ndarray:
+    """
+    Scales signals into weights whose portfolio volatility matches a target.
+
+    Each signal is first divided by its asset's volatility, so every position
+    contributes comparable risk, then the whole book is scaled to `target_vol`
+    and capped at `max_leverage` gross exposure.
+
+    Args:
+        cov (np.ndarray): Periodic covariance matrix.
+        signals (np.ndarray): Desired direction/conviction per asset (e.g. 1 long, 0 flat, -1 short).
+        target_vol (float): Annualized volatility target.
+        max_leverage (float): Cap on the sum of absolute weights.
+        periods_per_year (int): Periods per year used to annualize `cov`.
+
+    Returns:
+        np.ndarray: Portfolio weights.
+    """
+    signals = np.nan_to_num(np.asarray(signals, dtype=np.float64))
+    vols = np.sqrt(np.diag(cov))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        raw = np.where(vols > 0, signals / vols, 0.0)
+    raw = np.nan_to_num(raw)
+
+    portfolio_vol = np.sqrt(max(raw @ cov @ raw, 0.0) * periods_per_year)
+    if portfolio_vol == 0 or np.isnan(portfolio_vol):
+        return np.zeros_like(raw)
+    weights = raw * (target_vol / portfolio_vol)
+
+    gross = np.abs(weights).sum()
+    if gross > max_leverage:
+        weights *= max_leverage / gross
+    return weights
+
+
+class RiskModel:
+    """
+    Turns model signals into volatility-targeted position weights.
+
+    Used by the backtester's weight construction: `target_weights` gives the
+    weights to hold from the *next* period, using only data up to each date.
+    """
+
+    def __init__(
+        self,
+        estimator: str = RISK_CONFIG['estimator'],
+        window: int = RISK_CONFIG['window'],
+        halflife: float = RISK_CONFIG['halflife'],
+        target_vol: float = RISK_CONFIG['target_vol'],
+        max_leverage: float = RISK_CONFIG['max_leverage'],
+        benchmark: str = RISK_CONFIG['benchmark'],
+    ):
+        if estimator not in ESTIMATORS:
+            raise ValueError(f"Unknown estimator '{estimator}'. Choose one of {ESTIMATORS}.")
+        self.estimator = estimator
+        self.window = window
+        self.halflife = halflife
+        self.target_vol = target_vol
+        self.max_leverage = max_leverage
+        self.benchmark = benchmark
+
+    def covariances(self, returns: pd.DataFrame) -> Iterator[tuple[pd.Timestamp, np.ndarray]]:
+        return rolling_covariances(returns, self.estimator, self.window, self.halflife)
+
+    def target_weights(self, signals: pd.DataFrame, returns: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calculates volatility-targeted weights for each date.
+
+        Args:
+            signals (pd.DataFrame): Signals aligned with `returns` (same index and columns).
+            returns (pd.DataFrame): Periodic returns, one column per asset.
+
+        Returns:
+            pd.DataFrame: Weights per date; zero until the estimator has warmed up, and zero
+                for any asset without `window` valid returns in its trailing window (e.g.
+                recent listings or halts), whose zero-filled variance would be understated.
+                With 'ewma', gaps older than `window` still carry a decayed weight; see
+                `EWMACovariance`.
+        """
+        signals = signals.reindex(index=returns.index, columns=returns.columns).to_numpy(dtype=np.float64)
+        valid_counts = returns.notna().rolling(self.window, min_periods=1).sum().to_numpy()
+        eligible = valid_counts >= self.window
+        weights = np.zeros(returns.shape)
+        row_of = {timestamp: i for i, timestamp in enumerate(returns.index)}
+        for timestamp, cov in self.covariances(returns):
+            i = row_of[timestamp]
+            # Excluded assets get a zero signal, so they neither hold weight nor add to portfolio vol
+            sized_signals = np.where(eligible[i], signals[i], 0.0)
+            weights[i] = volatility_target_weights(cov, sized_signals, self.target_vol, self.max_leverage)
+        return pd.DataFrame(weights, index=returns.index, columns=returns.columns)
+
+    def betas(self, returns: pd.DataFrame) -> pd.DataFrame:
+        """Rolling betas of every asset against the configured benchmark."""
+        return rolling_betas(returns, self.benchmark, self.window)
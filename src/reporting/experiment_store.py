@@ -0,0 +1,233 @@
+import sys
+import os
+import json
+import hashlib
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from config import EXPERIMENTS_DIR
+
+CATALOG_PATH = EXPERIMENTS_DIR / "catalog.duckdb"
+
+# Columns that may be used for sorting; anything else is rejected to keep ORDER BY safe.
+SORTABLE_COLUMNS = ('created_at', 'ticker', 'start_date', 'end_date', 'sharpe_ratio',
+                    'max_drawdown', 'annualized_return')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id VARCHAR PRIMARY KEY,
+    created_at TIMESTAMP NOT NULL,
+    ticker VARCHAR NOT NULL,
+    start_date DATE,
+    end_date DATE,
+    data_hash VARCHAR,
+    params VARCHAR,
+    config VARCHAR,
+    sharpe_ratio DOUBLE,
+    max_drawdown DOUBLE,
+    annualized_return DOUBLE,
+    report_path VARCHAR
+);
+CREATE TABLE IF NOT EXISTS equity_curves (
+    run_id VARCHAR NOT NULL,
+    ts TIMESTAMP NOT NULL,
+    equity DOUBLE
+);
+CREATE INDEX IF NOT EXISTS runs_ticker_idx ON runs (ticker);
+CREATE INDEX IF NOT EXISTS runs_created_at_idx ON runs (created_at);
+CREATE INDEX IF NOT EXISTS equity_curves_run_idx ON equity_curves (run_id);
+"""
+
+
+def _finite_or_none(value) -> float | None:
+    """Stores NaN/inf metrics (e.g. the Sharpe of a run that never trades) as NULL so they sort last."""
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def hash_data(df: pd.DataFrame) -> str:
+    """Returns a stable SHA-256 hash of a DataFrame's index and values."""
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+
+class ExperimentStore:
+    """
+    Embedded DuckDB catalog of backtest runs.
+
+    Each run stores its config, the hash of the input data, summary metrics and
+    its equity curve, so runs can be compared and filtered without opening
+    their HTML reports.
+    """
+
+    def __init__(self, path: str | Path = CATALOG_PATH, read_only: bool = False):
+        """
+        Args:
+            path (str | Path): Location of the DuckDB file. Use ':memory:' for a throwaway catalog.
+            read_only (bool): Open an existing catalog without taking a write lock.
+        """
+        if str(path) != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.con = duckdb.connect(str(path), read_only=read_only)
+        if not read_only:
+            self.con.execute(SCHEMA)
+
+    def close(self):
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record_run(
+        self,
+        ticker: str,
+        metrics: dict,
+        equity_curve: pd.Series,
+        params: dict | None = None,
+        config: dict | None = None,
+        data_hash: str | None = None,
+        report_path: str | None = None,
+    ) -> str:
+        """
+        Stores a single backtest run.
+
+        Args:
+            ticker (str): The ticker the run was evaluated on.
+            metrics (dict): Must contain 'sharpe_ratio', 'max_drawdown' and 'annualized_return'.
+            equity_curve (pd.Series): Cumulative strategy returns indexed by timestamp.
+            params (dict, optional): Model parameters; stored as canonical JSON for filtering.
+            config (dict, optional): Full run configuration.
+            data_hash (str, optional): Hash of the input data, see `hash_data`.
+            report_path (str, optional): Path of the rendered HTML report.
+
+        Returns:
+            str: The generated run id.
+        """
+        run_id = uuid.uuid4().hex
+        index = equity_curve.index
+        start_date = index[0].date() if len(index) else None
+        end_date = index[-1].date() if len(index) else None
+
+        self.con.execute(
+            "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                run_id,
+                datetime.now(),
+                ticker.upper(),
+                start_date,
+                end_date,
+                data_hash,
+                json.dumps(params or {}, sort_keys=True, default=str),
+                json.dumps(config or {}, sort_keys=True, default=str),
+                _finite_or_none(metrics['sharpe_ratio']),
+                _finite_or_none(metrics['max_drawdown']),
+                _finite_or_none(metrics['annualized_return']),
+                str(report_path) if report_path is not None else None,
+            ],
+        )
+        timestamps = pd.DatetimeIndex(index)
+        if timestamps.tz is not None:
+            timestamps = timestamps.tz_localize(None)
+        curve = pd.DataFrame({
+            'run_id': run_id,
+            'ts': timestamps,
+            'equity': np.asarray(equity_curve, dtype=np.float64),
+        })
+        self.con.register('curve_df', curve)
+        self.con.execute("INSERT INTO equity_curves SELECT run_id, ts, equity FROM curve_df")
+        self.con.unregister('curve_df')
+        return run_id
+
+    def query_runs(
+        self,
+        ticker: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        params: dict | None = None,
+        sort_by: str = 'created_at',
+        descending: bool = True,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> pd.DataFrame:
+        """
+        Returns one page of runs matching the filters.
+
+        Args:
+            ticker (str, optional): Only runs for this ticker.
+            since (str, optional): Only runs created on or after this date (YYYY-MM-DD).
+            until (str, optional): Only runs created before this date (YYYY-MM-DD).
+            params (dict, optional): Only runs whose params contain these key/value pairs.
+                Matched with json_extract_string, so this filter scans the runs table.
+            sort_by (str): One of SORTABLE_COLUMNS.
+            descending (bool): Sort direction.
+            limit (int): Page size.
+            offset (int): Number of rows to skip.
+
+        Returns:
+            pd.DataFrame: Matching runs, without config or equity curves.
+        """
+        if sort_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot sort by '{sort_by}'. Choose one of {SORTABLE_COLUMNS}.")
+
+        where, args = self._filters(ticker, since, until, params)
+        sql = (
+            "SELECT run_id, created_at, ticker, start_date, end_date, sharpe_ratio, max_drawdown, "
+            "annualized_return, params, data_hash, report_path FROM runs"
+            f"{where} ORDER BY {sort_by} {'DESC' if descending else 'ASC'} NULLS LAST LIMIT ? OFFSET ?"
+        )
+        return self.con.execute(sql, args + [limit, offset]).df()
+
+    def count_runs(self, ticker: str | None = None, since: str | None = None,
+                   until: str | None = None, params: dict | None = None) -> int:
+        """Returns the number of runs matching the same filters as `query_runs`."""
+        where, args = self._filters(ticker, since, until, params)
+        return self.con.execute(f"SELECT count(*) FROM runs{where}", args).fetchone()[0]
+
+    def get_equity_curve(self, run_id: str) -> pd.Series:
+        """Loads the equity curve of a single run."""
+        df = self.con.execute(
+            "SELECT ts, equity FROM equity_curves WHERE run_id = ? ORDER BY ts", [run_id]
+        ).df()
+        return df.set_index('ts')['equity'].rename(run_id)
+
+    def get_config(self, run_id: str) -> dict:
+        """Loads the stored configuration of a single run."""
+        row = self.con.execute("SELECT config FROM runs WHERE run_id = ?", [run_id]).fetchone()
+        if row is None:
+            raise KeyError(f"No run with id {run_id}")
+        return json.loads(row[0])
+
+    @staticmethod
+    def _filters(ticker, since, until, params) -> tuple[str, list]:
+        clauses, args = [], []
+        if ticker:
+            clauses.append("ticker = ?")
+            args.append(ticker.upper())
+        if since:
+            clauses.append("created_at >= CAST(? AS TIMESTAMP)")
+            args.append(since)
+        if until:
+            clauses.append("created_at < CAST(? AS TIMESTAMP)")
+            args.append(until)
+        for key, value in (params or {}).items():
+            clauses.append("json_extract_string(params, ?) = ?")
+            args.extend([f"$.{key}", value if isinstance(value, str) else json.dumps(value)])
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, args
+
+
+if __name__ == '__main__':
+    with ExperimentStore(read_only=True) as store:
+        since = datetime.now().replace(day=1).strftime('%Y-%m-%d')
+        print(store.query_runs(ticker="SPY", since=since, sort_by='sharpe_ratio', limit=20))
@@ -4,7 +4,7 @@ from pathlib import Path
 import plotly.graph_objects as go
 from jinja2 import Environment, FileSystemLoader
 
-from src.backtesting.engine import Backtester
+from src.backtesting.engine import Backtester, BacktestResult
 from src.modeling.models.lightgbm_model import LightGBMModel
 
 def calculate_sharpe_ratio(returns, risk_free_rate=0):
@@ -17,16 +17,22 @@ def calculate_max_drawdown(cumulative_returns):
     drawdown = (cumulative_returns - peak) / peak
     return drawdown.min()
 
-def generate_html_report(backtest_results: pd.DataFrame, ticker: str, output_path: str):
-    """Generates an HTML report of the backtest results."""
+def calculate_metrics(backtest_results: BacktestResult) -> dict:
+    """Calculates the summary metrics shown in the report and stored in the experiment catalog."""
+    returns = backtest_results.strategy_returns
+    cumulative_returns = backtest_results.cumulative_strategy_returns
+    return {
+        'sharpe_ratio': calculate_sharpe_ratio(returns),
+        'max_drawdown': calculate_max_drawdown(cumulative_returns),
+        'annualized_return': returns.mean() * 252,
+    }
 
-    # Calculate metrics
-    returns = backtest_results['strategy_returns']
-    cumulative_returns = backtest_results['cumulative_strategy_returns']
+def generate_html_report(backtest_results: BacktestResult, ticker: str, output_path: str) -> dict:
+    """Generates an HTML report of the backtest results and returns its metrics."""
 
-    sharpe_ratio = calculate_sharpe_ratio(returns)
-    max_drawdown = calculate_max_drawdown(cumulative_returns)
-    annualized_return = returns.mean() * 252
+    # Calculate metrics
+    cumulative_returns = backtest_results.cumulative_strategy_returns
+    metrics = calculate_metrics(backtest_results)
 
     # Create plot
     fig = go.Figure()
@@ -60,15 +66,14 @@ def generate_html_report(backtest_results: pd.DataFrame, ticker: str, output_pat
 
     html = template.render(
         ticker=ticker,
-        annualized_return=annualized_return,
-        sharpe_ratio=sharpe_ratio,
-        max_drawdown=max_drawdown,
-        plot_html=plot_html
+        plot_html=plot_html,
+        **metrics
     )
 
     with open(output_path, 'w') as f:
         f.write(html)
     print(f"Report saved to {output_path}")
+    return metrics
 
 if __name__ == '__main__':
     # Load model and data
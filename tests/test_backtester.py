@@ -0,0 +1,133 @@
+import pandas as pd
+import numpy as np
+import pytest
+
+from src.backtesting.engine import Backtester
+from src.backtesting.intraday import IntradayBacktester
+from src.backtesting.risk import RiskModel
+
+@pytest.fixture
+def minute_bars_path(tmp_path):
+    """Writes synthetic minute bars with a precomputed target column in small row groups."""
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2024-01-02 09:30', periods=1000, freq='min', name='timestamp')
+    close = 100 + rng.standard_normal(1000).cumsum() * 0.05
+    df = pd.DataFrame({
+        'Open': close + rng.standard_normal(1000) * 0.01,
+        'Close': close,
+        'target_position': rng.choice([0.0, 10.0, -5.0], size=1000),
+    }, index=index)
+    path = tmp_path / "data.parquet"
+    df.to_parquet(path, row_group_size=128)
+    return path, df
+
+def test_intraday_chunking_matches_single_pass(minute_bars_path):
+    path, _ = minute_bars_path
+    chunked = IntradayBacktester(chunk_size=97).run(path)
+    single = IntradayBacktester(chunk_size=10_000).run(path)
+
+    assert chunked.bars == single.bars == 1000
+    assert chunked.trades == single.trades
+    assert chunked.final_equity == pytest.approx(single.final_equity)
+    assert chunked.max_drawdown == pytest.approx(single.max_drawdown)
+    assert chunked.bar_return_std == pytest.approx(single.bar_return_std)
+    assert len(chunked.equity_curve) == 11
+
+def test_intraday_next_bar_fill_with_costs(tmp_path):
+    index = pd.date_range('2024-01-02 09:30', periods=3, freq='min', name='timestamp')
+    df = pd.DataFrame({
+        'Open': [100.0, 101.0, 102.0],
+        'Close': [100.5, 101.5, 102.5],
+        'target_position': [10.0, 10.0, 0.0],
+    }, index=index)
+    path = tmp_path / "data.parquet"
+    df.to_parquet(path)
+
+    result = IntradayBacktester(initial_cash=10_000.0, slippage_bps=10, commission_bps=5).run(path)
+
+    # Bought 10 shares at the second bar's open; the exit order is still pending
+    fill = 101.0 * 1.001
+    cash = 10_000.0 - 10 * fill * 1.0005
+    assert result.trades == 1
+    assert result.final_position == 10.0
+    assert result.final_equity == pytest.approx(cash + 10 * 102.5)
+    assert result.commission_paid == pytest.approx(10 * fill * 0.0005)
+
+def test_intraday_strategy_lookback_spans_chunks(minute_bars_path):
+    path, _ = minute_bars_path
+
+    def strategy(bars):
+        return np.where(bars['Close'] > bars['Close'].rolling(20).mean(), 1.0, 0.0)
+
+    chunked = IntradayBacktester(strategy=strategy, chunk_size=128, lookback=20).run(path)
+    single = IntradayBacktester(strategy=strategy, chunk_size=10_000).run(path)
+
+    assert chunked.trades == single.trades
+    assert chunked.final_equity == pytest.approx(single.final_equity)
+
+def test_intraday_lookback_longer_than_chunk(minute_bars_path):
+    path, _ = minute_bars_path
+
+    def strategy(bars):
+        return np.where(bars['Close'] > bars['Close'].rolling(30).mean(), 1.0, 0.0)
+
+    chunked = IntradayBacktester(strategy=strategy, chunk_size=10, lookback=30).run(path)
+    single = IntradayBacktester(strategy=strategy, chunk_size=10_000).run(path)
+
+    assert single.trades > 0
+    assert chunked.trades == single.trades
+    assert chunked.final_equity == pytest.approx(single.final_equity)
+
+def test_intraday_skips_bars_with_missing_prices(minute_bars_path, tmp_path):
+    _, df = minute_bars_path
+    gappy = df.copy()
+    gappy.iloc[500, gappy.columns.get_loc('Open')] = np.nan
+    gappy.iloc[700, gappy.columns.get_loc('Close')] = np.nan
+    path = tmp_path / "gappy.parquet"
+    gappy.to_parquet(path, row_group_size=128)
+
+    result = IntradayBacktester().run(path)
+    expected_path = tmp_path / "dropped.parquet"
+    gappy.drop(gappy.index[[500, 700]]).to_parquet(expected_path, row_group_size=128)
+    expected = IntradayBacktester().run(expected_path)
+
+    assert result.skipped_bars == 2 and result.bars == 998
+    assert np.isfinite(result.final_equity) and np.isfinite(result.sharpe_ratio())
+    assert result.final_equity == pytest.approx(expected.final_equity)
+    assert result.max_drawdown == pytest.approx(expected.max_drawdown)
+
+class AlwaysLongModel:
+    """Stand-in model that always predicts an up day."""
+    def predict(self, X):
+        return np.ones(len(X), dtype=int)
+
+def test_backtester_sizes_positions_with_risk_model():
+    rng = np.random.default_rng(1)
+    index = pd.date_range('2020-01-01', periods=400, freq='B')
+    df = pd.DataFrame({'Close': 100 * np.cumprod(1 + rng.normal(0, 0.02, 400))}, index=index)
+
+    results = Backtester(AlwaysLongModel(), df, risk_model=RiskModel(window=63, target_vol=0.10)).run()
+
+    sized = results.position.iloc[63:]
+    assert (sized > 0).all() and (sized <= 1.0).all()
+    assert results.strategy_returns.iloc[63:].std() * np.sqrt(252) < 0.2
+
+def test_backtester_returns_compact_result_without_touching_input():
+    rng = np.random.default_rng(2)
+    index = pd.date_range('2020-01-01', periods=300, freq='B')
+    df = pd.DataFrame({'Close': 100 * np.cumprod(1 + rng.normal(0, 0.01, 300))}, index=index)
+    original = df.copy()
+
+    results = Backtester(AlwaysLongModel(), df).run()
+
+    pd.testing.assert_frame_equal(df, original)
+    assert not hasattr(results, '__dict__')
+    assert results.returns.dtype == np.float32 and results.equity.dtype == np.float32
+    assert np.shares_memory(results.index.asi8, df.index.asi8)
+
+    # Always long after the first bar, so the curve tracks the asset's own returns
+    asset_returns = df['Close'].pct_change().loc[results.index]
+    np.testing.assert_allclose(results.strategy_returns.iloc[1:], asset_returns.iloc[1:], rtol=1e-5)
+    np.testing.assert_allclose(results.cumulative_strategy_returns.iloc[-1],
+                               (1 + asset_returns.iloc[1:]).prod(), rtol=1e-4)
+    assert results.to_frame().shape == (len(results), 3)
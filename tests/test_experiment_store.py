@@ -0,0 +1,57 @@
+import pandas as pd
+import numpy as np
+import pytest
+
+from src.reporting.experiment_store import ExperimentStore, hash_data
+
+@pytest.fixture
+def store(tmp_path):
+    """Creates a catalog with a handful of runs across two tickers."""
+    store = ExperimentStore(tmp_path / "catalog.duckdb")
+    index = pd.date_range('2023-01-01', periods=50, freq='B')
+    for i, ticker in enumerate(["SPY", "SPY", "QQQ", "SPY"]):
+        curve = pd.Series(np.linspace(1.0, 1.0 + 0.1 * i, 50), index=index)
+        store.record_run(
+            ticker=ticker,
+            metrics={'sharpe_ratio': float(i), 'max_drawdown': -0.1, 'annualized_return': 0.05 * i},
+            equity_curve=curve,
+            params={'num_leaves': 31 if i % 2 else 63},
+            config={'run': i},
+        )
+    yield store
+    store.close()
+
+def test_query_runs_filters_and_sorts(store):
+    runs = store.query_runs(ticker="spy", sort_by='sharpe_ratio', limit=2)
+    assert list(runs['sharpe_ratio']) == [3.0, 1.0]
+    assert store.count_runs(ticker="SPY") == 3
+    assert store.count_runs(params={'num_leaves': 63}) == 2
+
+    second_page = store.query_runs(ticker="SPY", sort_by='sharpe_ratio', limit=2, offset=2)
+    assert list(second_page['sharpe_ratio']) == [0.0]
+
+def test_query_runs_rejects_unknown_sort_column(store):
+    with pytest.raises(ValueError):
+        store.query_runs(sort_by='sharpe_ratio; DROP TABLE runs')
+
+def test_equity_curve_and_config_round_trip(store):
+    run_id = store.query_runs(ticker="QQQ")['run_id'][0]
+    curve = store.get_equity_curve(run_id)
+    assert len(curve) == 50
+    assert curve.iloc[-1] == pytest.approx(1.2)
+    assert store.get_config(run_id) == {'run': 2}
+
+def test_hash_data_is_stable():
+    df = pd.DataFrame({'Close': [1.0, 2.0, 3.0]})
+    assert hash_data(df) == hash_data(df.copy())
+    assert hash_data(df) != hash_data(df * 2)
+
+def test_non_finite_metrics_sort_last(tmp_path):
+    with ExperimentStore(tmp_path / "catalog.duckdb") as store:
+        curve = pd.Series([1.0, 1.0], index=pd.date_range('2023-01-02', periods=2))
+        for sharpe in [1.5, np.nan, 0.7]:
+            store.record_run("SPY", {'sharpe_ratio': sharpe, 'max_drawdown': 0.0,
+                                     'annualized_return': 0.0}, curve)
+        runs = store.query_runs(sort_by='sharpe_ratio')
+        assert list(runs['sharpe_ratio'][:2]) == [1.5, 0.7]
+        assert pd.isna(runs['sharpe_ratio'][2])
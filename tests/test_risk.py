@@ -0,0 +1,111 @@
+import pandas as pd
+import numpy as np
+import pytest
+
+from src.backtesting.risk import (
+    EWMACovariance,
+    RiskModel,
+    RollingCovariance,
+    betas_from_covariance,
+    rolling_betas,
+    volatility_target_weights,
+)
+
+@pytest.fixture
+def synthetic_returns():
+    """Creates correlated daily returns for a small universe including SPY."""
+    rng = np.random.default_rng(42)
+    index = pd.date_range('2020-01-01', periods=300, freq='B')
+    market = rng.normal(0, 0.01, 300)
+    data = {'SPY': market}
+    for i, beta in enumerate([0.5, 1.0, 1.5]):
+        data[f'A{i}'] = beta * market + rng.normal(0, 0.01, 300)
+    return pd.DataFrame(data, index=index)
+
+def test_rolling_covariance_matches_window_recompute(synthetic_returns):
+    values = synthetic_returns.to_numpy()
+    window = 40
+    model = RollingCovariance(values.shape[1], window)
+    for i, row in enumerate(values):
+        model.update(row)
+    np.testing.assert_allclose(model.covariance(), np.cov(values[-window:], rowvar=False), rtol=1e-8)
+
+def test_ledoit_wolf_matches_sklearn(synthetic_returns):
+    covariance = pytest.importorskip("sklearn.covariance")
+    values = synthetic_returns.to_numpy()
+    window = 40
+    model = RollingCovariance(values.shape[1], window)
+    for row in values:
+        model.update(row)
+    shrunk, shrinkage = model.ledoit_wolf()
+    expected, expected_shrinkage = covariance.ledoit_wolf(values[-window:])
+    assert shrinkage == pytest.approx(expected_shrinkage)
+    np.testing.assert_allclose(shrunk, expected, rtol=1e-8)
+
+def test_ewma_covariance_weights_recent_observations():
+    model = EWMACovariance(1, halflife=1)
+    model.update([1.0])
+    model.update([2.0])
+    # Weights 0.5 (older) and 1 (newer), normalised
+    assert model.covariance()[0, 0] == pytest.approx((0.5 * 1 + 1 * 4) / 1.5)
+
+def test_betas_against_benchmark(synthetic_returns):
+    betas = rolling_betas(synthetic_returns, benchmark='SPY', window=300)
+    assert betas['SPY'].iloc[-1] == pytest.approx(1.0)
+    assert betas.iloc[:299].isna().all().all()
+
+    cov = np.cov(synthetic_returns.to_numpy(), rowvar=False)
+    np.testing.assert_allclose(betas.iloc[-1].to_numpy(), betas_from_covariance(cov, 0))
+
+def test_volatility_target_weights_hit_target(synthetic_returns):
+    cov = np.cov(synthetic_returns.to_numpy(), rowvar=False)
+    weights = volatility_target_weights(cov, np.ones(4), target_vol=0.05, max_leverage=10.0)
+    assert np.sqrt(weights @ cov @ weights * 252) == pytest.approx(0.05)
+
+    capped = volatility_target_weights(cov, np.ones(4), target_vol=1.0, max_leverage=1.0)
+    assert np.abs(capped).sum() == pytest.approx(1.0)
+
+def test_risk_model_weights_are_zero_during_warm_up(synthetic_returns):
+    signals = pd.DataFrame(1.0, index=synthetic_returns.index, columns=synthetic_returns.columns)
+    weights = RiskModel(estimator='ewma', window=20).target_weights(signals, synthetic_returns)
+    assert (weights.iloc[:19] == 0).all().all()
+    assert (weights.iloc[19:] > 0).all().all()
+
+def test_risk_model_excludes_assets_without_full_window(synthetic_returns):
+    returns = synthetic_returns.copy()
+    returns.iloc[:150, 1] = np.nan   # recently listed
+    returns.iloc[250:260, 2] = np.nan  # halted
+    signals = pd.DataFrame(1.0, index=returns.index, columns=returns.columns)
+    weights = RiskModel(estimator='sample', window=40).target_weights(signals, returns)
+
+    assert (weights.iloc[:189, 1] == 0).all()
+    assert (weights.iloc[189:, 1] > 0).all()
+    assert (weights.iloc[250:299, 2] == 0).all()
+    assert weights.iloc[249, 2] > 0 and weights.iloc[299, 2] > 0
+    assert (weights['SPY'].iloc[39:] > 0).all()
+
+@pytest.mark.parametrize('estimator', ['ledoit_wolf', 'sample'])
+def test_missing_asset_does_not_change_other_weights(synthetic_returns, estimator):
+    returns = synthetic_returns.iloc[:, 1:]
+    with_missing = returns.assign(NEW=np.nan)
+    model = RiskModel(estimator=estimator, window=40)
+
+    weights = model.target_weights(pd.DataFrame(1.0, index=returns.index, columns=returns.columns), returns)
+    padded = model.target_weights(
+        pd.DataFrame(1.0, index=with_missing.index, columns=with_missing.columns), with_missing)
+
+    assert (padded['NEW'] == 0).all()
+    np.testing.assert_allclose(padded[returns.columns].to_numpy(), weights.to_numpy(), rtol=1e-10, atol=1e-14)
+
+def test_ledoit_wolf_shrinks_eligible_block_like_sklearn(synthetic_returns):
+    covariance = pytest.importorskip("sklearn.covariance")
+    values = synthetic_returns.to_numpy().copy()
+    values[-10:, 3] = np.nan
+    window = 40
+    model = RollingCovariance(values.shape[1], window)
+    for row in values:
+        model.update(row)
+    shrunk, shrinkage = model.ledoit_wolf()
+    expected, expected_shrinkage = covariance.ledoit_wolf(values[-window:, :3])
+    assert shrinkage == pytest.approx(expected_shrinkage)
+    np.testing.assert_allclose(shrunk[:3, :3], expected, rtol=1e-8)